@@ -1,67 +1,261 @@
-from flask import Flask, render_template, request, redirect, url_for, session, flash
-from pymongo import MongoClient
+from flask import Blueprint, Flask, Response, current_app, render_template, request, redirect, url_for, session, flash
+from werkzeug.local import LocalProxy
+from werkzeug.security import generate_password_hash, check_password_hash
 from bson.objectid import ObjectId
-from dotenv import load_dotenv
+from datetime import datetime, timedelta
 import os
-import pandas as pd
-from werkzeug.security import generate_password_hash, check_password_hash
-from datetime import datetime
+import csv
+import io
+import itertools
+import json
+import re
+import zlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 import pytz
-from sendgrid import SendGridAPIClient
-from sendgrid.helpers.mail import Mail
 
-import requests
+from config import config
+
+# pandas, pymongo, sendgrid and requests are imported on first use, so
+# importing this module (gunicorn boot, tests, flask CLI) stays cheap.
 
-# ================= LOAD ENV =================
-load_dotenv()
+# ================= SHARED CLIENTS =================
+_clients = {}
+_client_locks = {}
+_client_locks_lock = threading.Lock()
 
-SECRET_KEY = os.getenv("SECRET_KEY")
-MONGO_URI = os.getenv("MONGO_URI")
 
-EMAIL_ADDRESS = os.getenv("EMAIL_ADDRESS")
-EMAIL_PASSWORD = os.getenv("EMAIL_PASSWORD")
+def get_client(key, factory):
+    """Return this process's client for key, creating it on first use.
 
-HF_API_KEY = os.getenv("HF_API_KEY")
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
+    Entries remember the PID that created them, so a forked worker builds
+    its own client instead of sharing the parent's sockets. Each key has its
+    own lock, so a slow factory only holds up callers of that same client.
+    """
+    pid = os.getpid()
+    entry = _clients.get(key)
 
-print("EMAIL:", EMAIL_ADDRESS)
-print("PASSWORD:", EMAIL_PASSWORD)
-print("PASSWORD LENGTH:", len(EMAIL_PASSWORD) if EMAIL_PASSWORD else "None")
+    if entry is None or entry[0] != pid:
+        with _client_locks_lock:
+            lock = _client_locks.setdefault(key, threading.Lock())
+
+        with lock:
+            entry = _clients.get(key)
+            if entry is None or entry[0] != pid:
+                entry = (pid, factory())
+                _clients[key] = entry
+
+    return entry[1]
 
-app = Flask(__name__)
-app.secret_key = SECRET_KEY
 
 # ================= DATABASE =================
-client = MongoClient(MONGO_URI)
-db = client["medvice_db"]
-
-users_collection = db["users"]
-results_collection = db["diagnosis_results"]
-contacts_collection = db["contacts"]
-
-# ================= LOAD DATASETS ONCE =================
-training_df = None
-description_df = None
-medication_df = None
-diet_df = None
-workout_df = None
-precautions_df = None
-
-try:
-    training_df = pd.read_csv("datasets/Training.csv")
+# How long to wait before retrying index creation after it fails
+INDEX_RETRY_SECONDS = 60
+
+_indexes_ready = set()
+_index_retry_at = {}
+_index_lock = threading.Lock()
+
+
+# (collection, keys, options) for every index the app relies on. Each is
+# created on its own, so one failing doesn't leave the others missing.
+INDEXES = [
+    # Lets register() rely on a single insert instead of find_one + insert_one.
+    # Fails if existing users already share a username; merge those first.
+    ("users", "username", {"unique": True}),
+
+    # One rollup document per (user, metric, key), e.g. ("disease", "Malaria")
+    # or ("month", "2025-03"); save_results() keeps the counts current.
+    ("diagnosis_analytics", [("user_id", 1), ("metric", 1), ("key", 1)], {"unique": True}),
+
+    # Serves dashboard history and date-range exports
+    ("diagnosis_results", [("user_id", 1), ("timestamp", 1)], {})
+]
+
+
+def ensure_indexes(db, key, strict=False):
+    """Create the app's indexes once per database; return True if all exist.
+
+    Failures are logged and retried at most every INDEX_RETRY_SECONDS, so an
+    unreachable server doesn't stall every request. With strict=True the
+    first error is raised instead, which is what warm_up() uses at startup.
+    """
+    if all((key, collection) in _indexes_ready for collection, _, _ in INDEXES):
+        return True
+
+    with _index_lock:
+        if not strict and time.monotonic() < _index_retry_at.get(key, 0):
+            return False
+
+        errors = []
+
+        for collection, keys, options in INDEXES:
+            if (key, collection) in _indexes_ready:
+                continue
+
+            try:
+                db[collection].create_index(keys, **options)
+                _indexes_ready.add((key, collection))
+
+            except Exception as e:
+                print(f"❌ Index creation error ({collection}):", str(e))
+                errors.append(e)
+
+        if errors:
+            _index_retry_at[key] = time.monotonic() + INDEX_RETRY_SECONDS
+            if strict:
+                raise errors[0]
+            return False
+
+        return True
+
+
+def mongo_key():
+    return ("mongo", current_app.config["MONGO_URI"], current_app.config["MONGO_DB_NAME"])
+
+
+def connect_db():
+    _, uri, name = key = mongo_key()
+
+    def connect():
+        from pymongo import MongoClient
+        return MongoClient(uri)[name]
+
+    return get_client(key, connect)
+
+
+def get_db():
+    db = connect_db()
+    ensure_indexes(db, mongo_key())
+    return db
+
+
+def username_index_ready():
+    ensure_indexes(connect_db(), mongo_key())
+    return (mongo_key(), "users") in _indexes_ready
+
+
+users_collection = LocalProxy(lambda: get_db()["users"])
+results_collection = LocalProxy(lambda: get_db()["diagnosis_results"])
+contacts_collection = LocalProxy(lambda: get_db()["contacts"])
+analytics_collection = LocalProxy(lambda: get_db()["diagnosis_analytics"])
+
+# ================= DATASETS =================
+_datasets = None
+_datasets_lock = threading.Lock()
+
+
+def load_datasets(dataset_dir):
+    import pandas as pd
+
+    def read(filename):
+        return pd.read_csv(os.path.join(dataset_dir, filename))
+
+    training_df = read("Training.csv")
     training_df.fillna(0, inplace=True)
     training_df.columns = training_df.columns.str.strip().str.lower()
 
-    description_df = pd.read_csv("datasets/description.csv")
-    medication_df = pd.read_csv("datasets/medications.csv")
-    diet_df = pd.read_csv("datasets/diets.csv")
-    workout_df = pd.read_csv("datasets/workout_df.csv")
-    precautions_df = pd.read_csv("datasets/precautions_df.csv")
+    return {
+        "training": training_df,
+        "description": read("description.csv"),
+        "medication": read("medications.csv"),
+        "diet": read("diets.csv"),
+        "workout": read("workout_df.csv"),
+        "precautions": read("precautions_df.csv")
+    }
+
+
+def get_datasets():
+    """Return the parsed datasets, loading them now if warm_up() has not.
+
+    Returns None if loading failed; callers then fall back to AI.
+    """
+    global _datasets
+
+    if _datasets is None:
+        with _datasets_lock:
+            if _datasets is None:
+                try:
+                    _datasets = load_datasets(current_app.config["DATASET_DIR"])
+                    print("✅ All datasets loaded successfully")
+
+                except Exception as e:
+                    print("❌ Dataset loading error:", str(e))
+                    # Don't retry on every request, same as loading at import did
+                    _datasets = {}
+
+    return _datasets or None
+
+
+# ================= WARM-UP =================
+def warm_up(app):
+    """Load datasets and connect to MongoDB before the first request.
+
+    Raises if the indexes can't be created, so a worker never starts
+    serving without the unique username index.
+    """
+    with app.app_context():
+        get_datasets()
+        ensure_indexes(connect_db(), mongo_key(), strict=True)
 
-    print("✅ All datasets loaded successfully")
 
-except Exception as e:
-    print("❌ Dataset loading error:", str(e))
+# ================= PASSWORD HASHING =================
+# Hashing is CPU-bound, so it runs on a small fixed pool instead of the
+# request thread. Requests beyond the pool plus HASH_QUEUE_LIMIT waiting
+# jobs are turned away at once rather than piling up behind each other.
+# The bound only matters with a threaded server (the Procfile runs gunicorn's
+# gthread worker); a sync worker handles a single request at a time anyway.
+class HashingBusyError(Exception):
+    pass
+
+
+def get_hash_pool():
+    workers = current_app.config["HASH_POOL_WORKERS"]
+    queue_limit = current_app.config["HASH_QUEUE_LIMIT"]
+
+    def create():
+        executor = ThreadPoolExecutor(
+            max_workers=workers,
+            thread_name_prefix="password-hash"
+        )
+        return executor, threading.BoundedSemaphore(workers + queue_limit)
+
+    return get_client(("hash_pool", workers, queue_limit), create)
+
+
+def run_hashing(fn, *args):
+    hash_executor, hash_slots = get_hash_pool()
+
+    if not hash_slots.acquire(blocking=False):
+        raise HashingBusyError()
+
+    def job():
+        # Free the slot before the caller sees the result
+        try:
+            return fn(*args)
+        finally:
+            hash_slots.release()
+
+    try:
+        future = hash_executor.submit(job)
+    except Exception:
+        hash_slots.release()
+        raise
+
+    return future.result()
+
+
+def hash_password(password):
+    return run_hashing(
+        generate_password_hash,
+        password,
+        current_app.config["PASSWORD_HASH_METHOD"]
+    )
+
+
+def verify_password(password_hash, password):
+    return run_hashing(check_password_hash, password_hash, password)
 
 
 # ================= TIME =================
@@ -70,19 +264,28 @@ def get_indian_time():
     return datetime.now(india)
 
 # ================= EMAIL =================
-SENDGRID_API_KEY = os.getenv("SENDGRID_API_KEY")
+def get_sendgrid():
+    api_key = current_app.config["SENDGRID_API_KEY"]
+
+    def create():
+        from sendgrid import SendGridAPIClient
+        return SendGridAPIClient(api_key)
+
+    return get_client(("sendgrid", api_key), create)
+
 
 def send_email(to_email, subject, body):
     try:
+        from sendgrid.helpers.mail import Mail
+
         message = Mail(
-            from_email=EMAIL_ADDRESS,  # must be verified sender
+            from_email=current_app.config["EMAIL_ADDRESS"],  # must be verified sender
             to_emails=to_email,
             subject=subject,
             plain_text_content=body
         )
 
-        sg = SendGridAPIClient(SENDGRID_API_KEY)
-        response = sg.send(message)
+        response = get_sendgrid().send(message)
 
         print("✅ SendGrid Email sent:", response.status_code)
         return True
@@ -95,17 +298,20 @@ def send_email(to_email, subject, body):
 # ================= SMS =================
 
 # ================= HUGGINGFACE =================
-OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY")
+def get_http():
+    def create():
+        import requests
+        return requests.Session()
+
+    return get_client("http", create)
 
-import json
-import re
 
 def call_ai(symptoms_input):
     try:
         API_URL = "https://openrouter.ai/api/v1/chat/completions"
 
         headers = {
-            "Authorization": f"Bearer {OPENROUTER_API_KEY}",
+            "Authorization": f"Bearer {current_app.config['OPENROUTER_API_KEY']}",
             "Content-Type": "application/json",
             "HTTP-Referer": "http://localhost:5000",
             "X-Title": "MedVice AI"
@@ -143,7 +349,7 @@ Return only JSON.
             "temperature": 0.2
         }
 
-        response = requests.post(API_URL, headers=headers, json=payload, timeout=60)
+        response = get_http().post(API_URL, headers=headers, json=payload, timeout=60)
 
         if response.status_code != 200:
             print("OpenRouter Error:", response.text)
@@ -195,11 +401,8 @@ Return only JSON.
 def hybrid_diagnosis(symptoms_input):
 
     try:
-        df = pd.read_csv("datasets/Training.csv")
-        df.fillna(0, inplace=True)
-
-        # Normalize dataset columns
-        df.columns = df.columns.str.strip().str.lower()
+        # Cached copy is already filled and normalized
+        df = get_datasets()["training"].copy()
 
         symptom_columns = df.columns[:-1]  # exclude prognosis column
 
@@ -260,57 +463,71 @@ def hybrid_diagnosis(symptoms_input):
         return call_ai(symptoms_input)
 
 # ================= ROUTES =================
-@app.route("/health")
+main = Blueprint("main", __name__)
+
+@main.route("/health")
 def health():
     return "OK", 200
 
-@app.route("/")
+@main.route("/")
 def root():
-    return redirect(url_for("home"))
+    return redirect(url_for("main.home"))
 
-@app.route("/home")
+@main.route("/home")
 def home():
     return render_template("index.html")
 
-@app.route("/about")
+@main.route("/about")
 def about():
     return render_template("about.html")
 
-@app.route("/services")
+@main.route("/services")
 def services():
     return render_template("services.html")
 
-@app.route("/map")
+@main.route("/map")
 def map():
     return render_template("map.html")
 
 # ================= REGISTER =================
 # ================= REGISTER =================
-@app.route("/register", methods=["GET", "POST"])
+@main.route("/register", methods=["GET", "POST"])
 def register():
     if request.method == "POST":
 
-        if users_collection.find_one({"username": request.form["username"]}):
+        from pymongo.errors import DuplicateKeyError
+
+        # Without the unique index, duplicate usernames would be accepted
+        if not username_index_ready():
+            flash("Registration is temporarily unavailable. Please try again later.", "error")
+            return redirect(url_for("main.register"))
+
+        try:
+            users_collection.insert_one({
+                "full_name": request.form["full_name"],
+                "email": request.form["email"],
+                "phone": request.form["phone"],
+                "username": request.form["username"],
+                "password": hash_password(request.form["password"]),
+                "created_at": get_indian_time()
+            })
+
+        except DuplicateKeyError:
             flash("Username already exists!", "error")
-            return redirect(url_for("register"))
-
-        users_collection.insert_one({
-            "full_name": request.form["full_name"],
-            "email": request.form["email"],
-            "phone": request.form["phone"],
-            "username": request.form["username"],
-            "password": generate_password_hash(request.form["password"]),
-            "created_at": get_indian_time()
-        })
+            return redirect(url_for("main.register"))
+
+        except HashingBusyError:
+            flash("Server is busy. Please try again in a moment.", "error")
+            return redirect(url_for("main.register"))
 
         flash("Registration successful! Please login.", "success")
-        return redirect(url_for("login"))
+        return redirect(url_for("main.login"))
 
     return render_template("register.html")
 
 # ================= LOGIN =================
 # ================= LOGIN =================
-@app.route("/login", methods=["GET", "POST"])
+@main.route("/login", methods=["GET", "POST"])
 def login():
     if request.method == "POST":
 
@@ -321,43 +538,49 @@ def login():
 
         if not user:
             flash("User not found!", "error")
-            return redirect(url_for("login"))
+            return redirect(url_for("main.login"))
 
-        if not check_password_hash(user["password"], password):
+        try:
+            password_ok = verify_password(user["password"], password)
+        except HashingBusyError:
+            flash("Too many login attempts right now. Please try again shortly.", "error")
+            return redirect(url_for("main.login"))
+
+        if not password_ok:
             flash("Incorrect password!", "error")
-            return redirect(url_for("login"))
+            return redirect(url_for("main.login"))
 
         # Successful login
         session["user_id"] = str(user["_id"])
         session["full_name"] = user["full_name"]
 
         flash(f"Welcome back, {user['full_name']}!", "success")
-        return redirect(url_for("symptoms"))
+        return redirect(url_for("main.symptoms"))
 
     return render_template("login.html")
 
 
-@app.route("/logout")
+@main.route("/logout")
 def logout():
     session.clear()
     flash("You have been logged out successfully.", "success")
-    return redirect(url_for("home"))
+    return redirect(url_for("main.home"))
 
 
 # ================= NEARBY HOSPITALS =================
-@app.route("/appointment")
+@main.route("/appointment")
 def appointment():
 
     # Optional: restrict access only after login
     if "user_id" not in session:
         flash("Please login to view nearby hospitals.")
-        return redirect(url_for("login"))
+        return redirect(url_for("main.login"))
 
     return render_template("appointment.html")
 
 
 # ================= SYMPTOMS =================
-@app.route("/symptoms", methods=["GET", "POST"])
+@main.route("/symptoms", methods=["GET", "POST"])
 def symptoms():
 
     if request.method == "POST":
@@ -365,17 +588,15 @@ def symptoms():
 
         if not symptoms_input:
             flash("Please enter symptoms", "error")
-            return redirect(url_for("symptoms"))
+            return redirect(url_for("main.symptoms"))
 
         session["symptoms_input"] = symptoms_input
-        return redirect(url_for("results"))
+        return redirect(url_for("main.results"))
 
     try:
-        df = pd.read_csv("datasets/Training.csv")
-        df.columns = df.columns.str.strip()
         all_symptoms = [
             col.replace("_", " ").title()
-            for col in df.columns[:-1]
+            for col in get_datasets()["training"].columns[:-1]
         ]
     except:
         all_symptoms = []
@@ -399,20 +620,27 @@ def render_ai_result(symptoms_input):
         ai_powered=True
     )
 
-@app.route("/results")
+@main.route("/results")
 def results():
 
-    global training_df, description_df, medication_df, diet_df, workout_df, precautions_df
-
     symptoms_input = session.get("symptoms_input", "")
     if not symptoms_input:
-        return redirect(url_for("symptoms"))
+        return redirect(url_for("main.symptoms"))
+
+    datasets = get_datasets()
 
     # 🔥 If dataset failed to load, fallback to AI
-    if training_df is None:
+    if datasets is None:
         print("⚠ Dataset not loaded → Using AI")
         return render_ai_result(symptoms_input)
 
+    training_df = datasets["training"]
+    description_df = datasets["description"]
+    medication_df = datasets["medication"]
+    diet_df = datasets["diet"]
+    workout_df = datasets["workout"]
+    precautions_df = datasets["precautions"]
+
     symptoms = [
         s.strip().lower().replace(" ", "_")
         for s in symptoms_input.split(",")
@@ -482,13 +710,41 @@ def results():
         return render_ai_result(symptoms_input)
 
 
+# ================= ANALYTICS ROLLUPS =================
+def update_analytics(user_id, prediction, timestamp):
+    """Increment the per-disease and per-month rollups for one saved diagnosis."""
+    if not prediction:
+        return
+
+    from pymongo import UpdateOne
+
+    rollups = [
+        ("disease", prediction),
+        ("month", timestamp.strftime("%Y-%m"))
+    ]
+
+    try:
+        analytics_collection.bulk_write([
+            UpdateOne(
+                {"user_id": user_id, "metric": metric, "key": key},
+                {"$inc": {"count": 1}},
+                upsert=True
+            )
+            for metric, key in rollups
+        ], ordered=False)
+
+    except Exception as e:
+        # The diagnosis itself is already saved; the backfill job can repair rollups.
+        print("❌ Analytics Rollup Error:", str(e))
+
+
 # ================= SAVE RESULTS =================
-@app.route("/save_results", methods=["POST"])
+@main.route("/save_results", methods=["POST"])
 def save_results():
 
     if "user_id" not in session:
         flash("Please login first.", "error")
-        return redirect(url_for("login"))
+        return redirect(url_for("main.login"))
 
     try:
         user_id = ObjectId(session["user_id"])
@@ -515,6 +771,8 @@ def save_results():
             "timestamp": timestamp
         })
 
+        update_analytics(user_id, prediction, timestamp)
+
         user = users_collection.find_one({"_id": user_id})
 
         if user:
@@ -575,20 +833,20 @@ Team MedVice
         else:
             flash("Diagnosis saved successfully!", "success")
 
-        return redirect(url_for("dashboard"))
+        return redirect(url_for("main.dashboard"))
 
     except Exception as e:
         print("❌ Save Results Error:", str(e))
         flash("Failed to save diagnosis. Please try again.", "error")
-        return redirect(url_for("results"))
+        return redirect(url_for("main.results"))
 
 
 # ================= DASHBOARD =================
-@app.route("/dashboard")
+@main.route("/dashboard")
 def dashboard():
 
     if "user_id" not in session:
-        return redirect(url_for("login"))
+        return redirect(url_for("main.login"))
 
     results = list(
         results_collection.find(
@@ -615,8 +873,179 @@ def dashboard():
 
     return render_template("dashboard.html", results=results)
 
+# ================= EXPORT =================
+EXPORT_LIST_FIELDS = ["medications", "precautions", "diets", "workouts"]
+EXPORT_FIELDS = ["timestamp", "prediction", "description"] + EXPORT_LIST_FIELDS
+
+
+def parse_export_date(value):
+    """Parse a YYYY-MM-DD query value as midnight IST, or None if absent."""
+    if not value:
+        return None
+    india = pytz.timezone("Asia/Kolkata")
+    return india.localize(datetime.strptime(value, "%Y-%m-%d"))
+
+
+def export_row(r):
+    row = {}
+    for field in EXPORT_FIELDS:
+        value = r.get(field)
+        if field == "timestamp" and value is not None:
+            value = value.replace(tzinfo=pytz.utc).isoformat()
+        elif value is None:
+            value = [] if field in EXPORT_LIST_FIELDS else ""
+        row[field] = value
+    return row
+
+
+# Spreadsheet apps treat cells starting with these as formulas
+CSV_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def csv_cell(value):
+    if isinstance(value, list):
+        value = "; ".join(str(v) for v in value)
+    if isinstance(value, str) and value.startswith(CSV_FORMULA_PREFIXES):
+        value = "'" + value
+    return value
+
+
+def export_chunks(cursor, fmt, batch_size):
+    """Yield the cursor as CSV or NDJSON, one text chunk per batch."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    if fmt == "csv":
+        writer.writerow(EXPORT_FIELDS)
+
+    try:
+        for count, r in enumerate(cursor, start=1):
+            row = export_row(r)
+
+            if fmt == "csv":
+                writer.writerow([csv_cell(v) for v in row.values()])
+            else:
+                buffer.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+            if count % batch_size == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+
+        yield buffer.getvalue()
+
+    finally:
+        cursor.close()
+
+
+def gzip_chunks(chunks):
+    compressor = zlib.compressobj(wbits=31)  # gzip container
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode("utf-8"))
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+@main.route("/export")
+def export():
+
+    if "user_id" not in session:
+        flash("Please login first.", "error")
+        return redirect(url_for("main.login"))
+
+    fmt = request.args.get("format", "csv").lower()
+    if fmt not in ("csv", "ndjson"):
+        return "Unsupported export format. Use csv or ndjson.", 400
+
+    try:
+        start = parse_export_date(request.args.get("start"))
+        end = parse_export_date(request.args.get("end"))
+    except ValueError:
+        return "Dates must use the YYYY-MM-DD format.", 400
+
+    query = {"user_id": ObjectId(session["user_id"])}
+
+    if start or end:
+        query["timestamp"] = {}
+        if start:
+            query["timestamp"]["$gte"] = start
+        if end:
+            # End date is inclusive
+            query["timestamp"]["$lt"] = end + timedelta(days=1)
+
+    batch_size = current_app.config["EXPORT_BATCH_SIZE"]
+
+    cursor = results_collection.find(
+        query,
+        {"_id": 0, **{field: 1 for field in EXPORT_FIELDS}}
+    ).sort("timestamp", 1).batch_size(batch_size)
+
+    body = export_chunks(cursor, fmt, batch_size)
+
+    # Run the query and fetch the first batch before any headers go out, so
+    # a database error becomes an error response, not a truncated download
+    try:
+        first_chunk = next(body)
+    except Exception as e:
+        print("❌ Export Error:", str(e))
+        return "Export failed. Please try again later.", 503
+
+    body = itertools.chain([first_chunk], body)
+    filename = f"medvice_history.{fmt}"
+
+    if request.args.get("gzip") in ("1", "true", "yes"):
+        body = gzip_chunks(body)
+        filename += ".gz"
+        mimetype = "application/gzip"
+    else:
+        body = (chunk.encode("utf-8") for chunk in body)
+        mimetype = "text/csv" if fmt == "csv" else "application/x-ndjson"
+
+    return Response(
+        body,
+        mimetype=mimetype,
+        headers={"Content-Disposition": f"attachment; filename={filename}"}
+    )
+
+# ================= ANALYTICS =================
+@main.route("/analytics")
+def analytics():
+
+    if "user_id" not in session:
+        return redirect(url_for("main.login"))
+
+    rollups = analytics_collection.find(
+        {"user_id": ObjectId(session["user_id"])},
+        {"_id": 0, "metric": 1, "key": 1, "count": 1}
+    )
+
+    diseases = []
+    months = []
+
+    for r in rollups:
+        if r["metric"] == "disease":
+            diseases.append(r)
+        elif r["metric"] == "month":
+            months.append(r)
+
+    diseases.sort(key=lambda r: r["count"], reverse=True)
+    months.sort(key=lambda r: r["key"])
+
+    for m in months:
+        m["label"] = datetime.strptime(m["key"], "%Y-%m").strftime("%b %Y")
+
+    return render_template(
+        "analytics.html",
+        # Every saved diagnosis with a prediction has a disease rollup; month
+        # rollups can be missing (e.g. backfilled docs without a timestamp)
+        total=sum(d["count"] for d in diseases),
+        diseases=diseases,
+        months=months
+    )
+
 # ================= CONTACT =================
-@app.route("/contact", methods=["GET", "POST"])
+@main.route("/contact", methods=["GET", "POST"])
 def contact():
 
     if request.method == "POST":
@@ -641,7 +1070,7 @@ Email: {email}
 Message:
 {message}
 """
-        send_email(EMAIL_ADDRESS, "📩 New Contact Message - MedVice", admin_body)
+        send_email(current_app.config["EMAIL_ADDRESS"], "📩 New Contact Message - MedVice", admin_body)
 
         user_body = f"""
 Hello {full_name},
@@ -654,10 +1083,39 @@ MedVice
         send_email(email, "✅ Message Received - MedVice", user_body)
 
         flash("Message sent successfully!")
-        return redirect(url_for("contact"))
+        return redirect(url_for("main.contact"))
 
     return render_template("contact.html")
 
 
+# ================= APP FACTORY =================
+def create_app(config_name=None):
+    app = Flask(__name__)
+    app.config.from_object(config[config_name or os.getenv("FLASK_CONFIG", "default")])
+
+    if not app.config["SECRET_KEY"] and not (app.debug or app.testing):
+        raise RuntimeError("SECRET_KEY must be set outside development and testing")
+
+    # Leave request threads free for non-login traffic during a login flood
+    hashing_slots = app.config["HASH_POOL_WORKERS"] + app.config["HASH_QUEUE_LIMIT"]
+    if hashing_slots >= app.config["WEB_THREADS"]:
+        raise RuntimeError(
+            "HASH_POOL_WORKERS + HASH_QUEUE_LIMIT must be less than WEB_THREADS"
+        )
+
+    app.register_blueprint(main)
+
+    @app.cli.command("warm-up")
+    def warm_up_command():
+        """Load datasets and connect to MongoDB."""
+        warm_up(app)
+
+    if app.config["WARM_UP_ON_START"]:
+        warm_up(app)
+
+    return app
+
+
 if __name__ == "__main__":
-    app.run()
+    # Never start the interactive debugger or reloader from a plain run
+    create_app().run(debug=False)
@@ -0,0 +1,70 @@
+# backfill_analytics.py
+# Rebuilds the diagnosis_analytics rollups from the full diagnosis_results
+# history. Run once before enabling /analytics, or any time the rollups drift.
+#
+# Run it with writes stopped (app scaled to zero or in maintenance mode).
+# Each count is overwritten with a point-in-time $group result, so a
+# save_results() $inc that lands between the aggregation reading and
+# $merge writing is lost. With writes stopped, re-running is safe.
+from pymongo import MongoClient
+
+from config import Config
+
+client = MongoClient(Config.MONGO_URI)
+db = client[Config.MONGO_DB_NAME]
+
+results_collection = db["diagnosis_results"]
+analytics_collection = db["diagnosis_analytics"]
+
+# $merge matches on these fields, so they need a unique index
+analytics_collection.create_index(
+    [("user_id", 1), ("metric", 1), ("key", 1)],
+    unique=True
+)
+
+
+def rollup_pipeline(metric, key_expr, match):
+    return [
+        {"$match": match},
+        {"$group": {
+            "_id": {"user_id": "$user_id", "key": key_expr},
+            "count": {"$sum": 1}
+        }},
+        {"$project": {
+            "_id": 0,
+            "user_id": "$_id.user_id",
+            "metric": {"$literal": metric},
+            "key": "$_id.key",
+            "count": 1
+        }},
+        {"$merge": {
+            "into": analytics_collection.name,
+            "on": ["user_id", "metric", "key"],
+            "whenMatched": [{"$set": {"count": "$$new.count"}}],
+            "whenNotMatched": "insert"
+        }}
+    ]
+
+
+# Only diagnoses with a prediction are counted, matching save_results()
+has_prediction = {"prediction": {"$nin": [None, ""]}}
+
+# Per-user disease counts
+results_collection.aggregate(rollup_pipeline(
+    "disease",
+    "$prediction",
+    has_prediction
+))
+
+# Per-user monthly counts, bucketed in IST like the rest of the app
+results_collection.aggregate(rollup_pipeline(
+    "month",
+    {"$dateToString": {
+        "format": "%Y-%m",
+        "date": "$timestamp",
+        "timezone": "Asia/Kolkata"
+    }},
+    {**has_prediction, "timestamp": {"$type": "date"}}
+))
+
+print("✅ Analytics rollups rebuilt:", analytics_collection.count_documents({}))
@@ -0,0 +1,119 @@
+# bench_login_flood.py
+# Floods /login on a running MedVice server and measures how diagnosis
+# requests (/symptoms -> /results) hold up while it happens.
+#
+#   python bench_login_flood.py --url http://localhost:5000 \
+#       --username demo --password demo123 --flood 32 --seconds 15
+#
+# The user must already exist. Benchmark the server the way the Procfile
+# runs it (gunicorn with the gthread worker), not the Flask dev server.
+# Run it once against the old code and once against the new one with the
+# same server settings to compare.
+import argparse
+import statistics
+import threading
+import time
+
+import requests
+
+SYMPTOMS = "itching, skin rash, nodal skin eruptions"
+
+
+def login_worker(url, username, password, stop, stats, lock):
+    http = requests.Session()
+    while not stop.is_set():
+        start = time.perf_counter()
+        response = http.post(
+            f"{url}/login",
+            data={"username": username, "password": password},
+            allow_redirects=False
+        )
+        elapsed = time.perf_counter() - start
+
+        # A successful login redirects to /symptoms; anything else is a
+        # rejection (wrong password or the hashing pool turning us away)
+        ok = response.headers.get("Location", "").endswith("/symptoms")
+
+        with lock:
+            stats["ok" if ok else "rejected"] += 1
+            stats["latency"].append(elapsed)
+
+
+def diagnosis_latencies(url, seconds):
+    http = requests.Session()
+    latencies = []
+    deadline = time.perf_counter() + seconds
+
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        http.post(f"{url}/symptoms", data={"symptoms": SYMPTOMS}, allow_redirects=False)
+        http.get(f"{url}/results")
+        latencies.append(time.perf_counter() - start)
+
+    return latencies
+
+
+def summarize(name, latencies):
+    if not latencies:
+        print(f"{name}: no samples")
+        return
+
+    latencies = sorted(latencies)
+    pct = lambda p: latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000
+
+    print(
+        f"{name}: n={len(latencies)} "
+        f"p50={pct(0.50):.1f}ms p95={pct(0.95):.1f}ms p99={pct(0.99):.1f}ms "
+        f"mean={statistics.mean(latencies) * 1000:.1f}ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default="http://localhost:5000")
+    parser.add_argument("--username", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--flood", type=int, default=32, help="concurrent login clients")
+    parser.add_argument("--seconds", type=float, default=15)
+    args = parser.parse_args()
+
+    url = args.url.rstrip("/")
+
+    print("== Baseline (no login traffic) ==")
+    summarize("diagnosis", diagnosis_latencies(url, args.seconds))
+
+    print(f"== Login flood ({args.flood} clients) ==")
+    stop = threading.Event()
+    lock = threading.Lock()
+    stats = {"ok": 0, "rejected": 0, "latency": []}
+
+    workers = [
+        threading.Thread(
+            target=login_worker,
+            args=(url, args.username, args.password, stop, stats, lock),
+            daemon=True
+        )
+        for _ in range(args.flood)
+    ]
+
+    started = time.perf_counter()
+    for w in workers:
+        w.start()
+
+    diagnosis = diagnosis_latencies(url, args.seconds)
+
+    stop.set()
+    for w in workers:
+        w.join()
+    elapsed = time.perf_counter() - started
+
+    summarize("diagnosis", diagnosis)
+    summarize("login", stats["latency"])
+    print(
+        f"login throughput: {stats['ok'] / elapsed:.1f} ok/s, "
+        f"{stats['rejected'] / elapsed:.1f} rejected/s"
+    )
+
+
+if __name__ == "__main__":
+    main()
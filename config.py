@@ -1,6 +1,11 @@
 # config.py
 import os
 from datetime import timedelta
+from dotenv import load_dotenv
+
+load_dotenv()
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
 class Config:
     """Base configuration."""
@@ -19,17 +24,60 @@ class Config:
     # Session configuration
     PERMANENT_SESSION_LIFETIME = timedelta(days=31)
 
+    # MongoDB
+    MONGO_URI = os.environ.get('MONGO_URI')
+    MONGO_DB_NAME = os.environ.get('MONGO_DB_NAME', 'medvice_db')
+
+    # SendGrid (EMAIL_ADDRESS must be a verified sender)
+    SENDGRID_API_KEY = os.environ.get('SENDGRID_API_KEY')
+    EMAIL_ADDRESS = os.environ.get('EMAIL_ADDRESS')
+
+    # OpenRouter AI fallback
+    OPENROUTER_API_KEY = os.environ.get('OPENROUTER_API_KEY')
+
+    # Werkzeug hash method for new passwords, cost included, e.g.
+    # 'scrypt:32768:8:1' (n:r:p) or 'pbkdf2:sha256:600000' (iterations).
+    # Existing hashes verify with whatever method they were created with.
+    PASSWORD_HASH_METHOD = os.environ.get('PASSWORD_HASH_METHOD', 'scrypt:32768:8:1')
+
+    # Request threads per gunicorn worker; the Procfile passes the same
+    # WEB_THREADS value to --threads
+    WEB_THREADS = int(os.environ.get('WEB_THREADS', 8))
+
+    # Size of the pool that runs password hashing. Every hashing job holds a
+    # request thread while it waits, so HASH_POOL_WORKERS + HASH_QUEUE_LIMIT
+    # must stay below WEB_THREADS or a login flood can occupy every thread.
+    # create_app() enforces this.
+    HASH_POOL_WORKERS = int(os.environ.get('HASH_POOL_WORKERS', 2))
+    HASH_QUEUE_LIMIT = int(os.environ.get('HASH_QUEUE_LIMIT', 2))
+
+    # Documents fetched per cursor batch when streaming /export
+    EXPORT_BATCH_SIZE = int(os.environ.get('EXPORT_BATCH_SIZE', 500))
+
+    # Datasets are loaded on first use unless warmed up at startup
+    DATASET_DIR = os.environ.get('DATASET_DIR', os.path.join(BASE_DIR, 'datasets'))
+    WARM_UP_ON_START = False
+
 class DevelopmentConfig(Config):
     """Development configuration."""
     DEBUG = True
     
+class TestingConfig(Config):
+    """Testing configuration."""
+    TESTING = True
+    PASSWORD_HASH_METHOD = 'pbkdf2:sha256:1000'
+
 class ProductionConfig(Config):
     """Production configuration."""
     DEBUG = False
+    # No fallback: create_app() refuses to start without a real key
+    SECRET_KEY = os.environ.get('SECRET_KEY')
+    WARM_UP_ON_START = True
     
 # Dictionary with different configuration environments
 config = {
     'development': DevelopmentConfig,
+    'testing': TestingConfig,
     'production': ProductionConfig,
     'default': DevelopmentConfig
 }
\ No newline at end of file
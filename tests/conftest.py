@@ -0,0 +1,19 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app as medvice  # noqa: E402
+
+
+@pytest.fixture
+def app():
+    return medvice.create_app("testing")
+
+
+@pytest.fixture
+def app_context(app):
+    with app.app_context():
+        yield app
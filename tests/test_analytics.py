@@ -0,0 +1,138 @@
+from datetime import datetime
+
+import pytz
+from bson.objectid import ObjectId
+from pymongo import UpdateOne
+
+import app as medvice
+
+
+class FakeCollection:
+    def __init__(self, docs=()):
+        self.docs = list(docs)
+        self.calls = []
+
+    def bulk_write(self, ops, ordered=True):
+        self.calls.append((ops, ordered))
+
+    def find(self, query, projection=None):
+        self.calls.append((query, projection))
+        return [dict(d) for d in self.docs if d["user_id"] == query["user_id"]]
+
+
+def logged_in_client(app, user_id):
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session["user_id"] = str(user_id)
+    return client
+
+
+def rollup(user_id, metric, key, count):
+    return {"user_id": user_id, "metric": metric, "key": key, "count": count}
+
+
+def test_update_analytics_increments_disease_and_month(monkeypatch):
+    collection = FakeCollection()
+    monkeypatch.setattr(medvice, "analytics_collection", collection)
+
+    user_id = ObjectId()
+    timestamp = pytz.timezone("Asia/Kolkata").localize(datetime(2025, 3, 31, 23, 30))
+
+    medvice.update_analytics(user_id, "Malaria", timestamp)
+
+    assert collection.calls == [([
+        UpdateOne(
+            {"user_id": user_id, "metric": "disease", "key": "Malaria"},
+            {"$inc": {"count": 1}},
+            upsert=True
+        ),
+        UpdateOne(
+            {"user_id": user_id, "metric": "month", "key": "2025-03"},
+            {"$inc": {"count": 1}},
+            upsert=True
+        )
+    ], False)]
+
+
+def test_update_analytics_skips_empty_prediction(monkeypatch):
+    collection = FakeCollection()
+    monkeypatch.setattr(medvice, "analytics_collection", collection)
+
+    medvice.update_analytics(ObjectId(), "", datetime.now(pytz.utc))
+
+    assert collection.calls == []
+
+
+def test_update_analytics_swallows_write_errors(monkeypatch):
+    class FailingCollection:
+        def bulk_write(self, ops, ordered=True):
+            raise RuntimeError("mongo down")
+
+    monkeypatch.setattr(medvice, "analytics_collection", FailingCollection())
+
+    medvice.update_analytics(ObjectId(), "Flu", datetime.now(pytz.utc))
+
+
+def test_analytics_requires_login(app):
+    response = app.test_client().get("/analytics")
+
+    assert response.status_code == 302
+    assert response.location.endswith("/login")
+
+
+def test_analytics_reads_only_own_rollups(app, monkeypatch):
+    user_id = ObjectId()
+    collection = FakeCollection([
+        rollup(user_id, "disease", "Flu", 1),
+        rollup(user_id, "disease", "Malaria", 3),
+        rollup(user_id, "month", "2025-02", 1),
+        rollup(user_id, "month", "2025-01", 3),
+        rollup(ObjectId(), "disease", "Typhoid", 9)
+    ])
+    monkeypatch.setattr(medvice, "analytics_collection", collection)
+
+    page = logged_in_client(app, user_id).get("/analytics").data.decode()
+
+    assert collection.calls == [(
+        {"user_id": user_id},
+        {"_id": 0, "metric": 1, "key": 1, "count": 1}
+    )]
+    assert '<div class="analytics-total">4</div>' in page
+    assert page.index("Malaria") < page.index("Flu")
+    assert page.index("Jan 2025") < page.index("Feb 2025")
+    assert "Typhoid" not in page
+
+
+def test_analytics_with_only_month_rollups(app, monkeypatch):
+    user_id = ObjectId()
+    monkeypatch.setattr(medvice, "analytics_collection", FakeCollection([
+        rollup(user_id, "month", "2025-01", 2)
+    ]))
+
+    response = logged_in_client(app, user_id).get("/analytics")
+    page = response.data.decode()
+
+    assert response.status_code == 200
+    assert "Jan 2025" in page
+    assert "Most Frequent Predictions" not in page
+
+
+def test_analytics_with_only_disease_rollups(app, monkeypatch):
+    user_id = ObjectId()
+    monkeypatch.setattr(medvice, "analytics_collection", FakeCollection([
+        rollup(user_id, "disease", "Malaria", 2)
+    ]))
+
+    page = logged_in_client(app, user_id).get("/analytics").data.decode()
+
+    assert '<div class="analytics-total">2</div>' in page
+    assert "Diagnoses per Month" not in page
+    assert "not saved any diagnosis" not in page
+
+
+def test_analytics_without_rollups(app, monkeypatch):
+    monkeypatch.setattr(medvice, "analytics_collection", FakeCollection())
+
+    page = logged_in_client(app, ObjectId()).get("/analytics").data.decode()
+
+    assert "not saved any diagnosis" in page
@@ -0,0 +1,77 @@
+import threading
+
+import pytest
+
+import app as medvice
+from config import ProductionConfig, TestingConfig
+
+
+def test_create_app_uses_testing_config(app):
+    assert app.testing
+    assert app.config["PASSWORD_HASH_METHOD"] == TestingConfig.PASSWORD_HASH_METHOD
+    assert "main" in app.blueprints
+
+
+def test_create_app_serves_without_mongo(app):
+    response = app.test_client().get("/health")
+
+    assert response.status_code == 200
+    assert response.data == b"OK"
+
+
+def test_create_app_defers_warm_up(monkeypatch):
+    calls = []
+    monkeypatch.setattr(medvice, "warm_up", calls.append)
+
+    medvice.create_app("testing")
+
+    assert calls == []
+
+
+def test_production_requires_secret_key(monkeypatch):
+    monkeypatch.setattr(ProductionConfig, "SECRET_KEY", None)
+
+    with pytest.raises(RuntimeError, match="SECRET_KEY"):
+        medvice.create_app("production")
+
+
+def test_get_client_reuses_per_process(monkeypatch):
+    monkeypatch.setattr(medvice, "_clients", {})
+    created = []
+
+    def factory():
+        created.append(object())
+        return created[-1]
+
+    first = medvice.get_client("test", factory)
+    assert medvice.get_client("test", factory) is first
+
+    # A forked child sees a different PID and builds its own client
+    monkeypatch.setattr(medvice.os, "getpid", lambda: -1)
+    assert medvice.get_client("test", factory) is not first
+    assert len(created) == 2
+
+
+def test_get_client_slow_factory_does_not_block_other_keys(monkeypatch):
+    monkeypatch.setattr(medvice, "_clients", {})
+    monkeypatch.setattr(medvice, "_client_locks", {})
+
+    entered = threading.Event()
+    release = threading.Event()
+
+    def slow_factory():
+        entered.set()
+        release.wait(5)
+        return "slow"
+
+    worker = threading.Thread(target=medvice.get_client, args=("slow", slow_factory))
+    worker.start()
+    entered.wait(5)
+
+    try:
+        assert medvice.get_client("fast", lambda: "fast") == "fast"
+    finally:
+        release.set()
+        worker.join(5)
+
+    assert medvice.get_client("slow", slow_factory) == "slow"
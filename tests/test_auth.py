@@ -0,0 +1,147 @@
+import os
+import threading
+
+import pytest
+from werkzeug.security import check_password_hash
+
+import app as medvice
+from config import TestingConfig
+
+
+class FakeCollection:
+    def __init__(self, error=None):
+        self.error = error
+        self.indexes = []
+
+    def create_index(self, keys, **kwargs):
+        if self.error:
+            raise self.error
+        self.indexes.append((keys, kwargs))
+
+
+class FakeDB(dict):
+    def __missing__(self, name):
+        self[name] = FakeCollection()
+        return self[name]
+
+
+@pytest.fixture(autouse=True)
+def reset_index_state(monkeypatch):
+    monkeypatch.setattr(medvice, "_indexes_ready", set())
+    monkeypatch.setattr(medvice, "_index_retry_at", {})
+
+
+def test_hash_password_uses_configured_method(app_context):
+    app_context.config["PASSWORD_HASH_METHOD"] = "pbkdf2:sha256:1234"
+
+    hashed = medvice.hash_password("secret")
+
+    assert hashed.startswith("pbkdf2:sha256:1234$")
+    assert medvice.verify_password(hashed, "secret")
+    assert not medvice.verify_password(hashed, "wrong")
+
+
+def test_default_hash_method_is_scrypt():
+    assert medvice.config["production"].PASSWORD_HASH_METHOD.startswith("scrypt")
+
+
+def test_run_hashing_rejects_when_pool_and_queue_are_full(app_context):
+    app_context.config.update(HASH_POOL_WORKERS=1, HASH_QUEUE_LIMIT=0)
+
+    started = threading.Event()
+    release = threading.Event()
+
+    def slow_job():
+        started.set()
+        release.wait(5)
+        return "done"
+
+    result = []
+
+    def hold_slot():
+        with app_context.app_context():
+            result.append(medvice.run_hashing(slow_job))
+
+    worker = threading.Thread(target=hold_slot)
+    worker.start()
+    started.wait(5)
+
+    with pytest.raises(medvice.HashingBusyError):
+        medvice.run_hashing(check_password_hash, "x", "y")
+
+    release.set()
+    worker.join(5)
+
+    # The slot is freed once the job finishes
+    assert result == ["done"]
+    assert medvice.run_hashing(lambda: "again") == "again"
+
+
+def test_ensure_indexes_creates_unique_username_index():
+    db = FakeDB()
+
+    assert medvice.ensure_indexes(db, "key")
+    assert db["users"].indexes == [("username", {"unique": True})]
+    assert ("key", "users") in medvice._indexes_ready
+
+
+def test_ensure_indexes_failure_is_reported_and_backed_off():
+    db = FakeDB(users=FakeCollection(error=RuntimeError("duplicate key")))
+
+    assert not medvice.ensure_indexes(db, "key")
+
+    # Within the retry window nothing is attempted again
+    db["users"].error = None
+    assert not medvice.ensure_indexes(db, "key")
+    assert db["users"].indexes == []
+
+
+def test_ensure_indexes_failing_users_index_keeps_the_others():
+    db = FakeDB(users=FakeCollection(error=RuntimeError("duplicate key")))
+
+    assert not medvice.ensure_indexes(db, "key")
+
+    assert db["diagnosis_results"].indexes == [([("user_id", 1), ("timestamp", 1)], {})]
+    assert db["diagnosis_analytics"].indexes
+    assert ("key", "users") not in medvice._indexes_ready
+    assert ("key", "diagnosis_results") in medvice._indexes_ready
+
+
+def test_ensure_indexes_strict_raises():
+    db = FakeDB(users=FakeCollection(error=RuntimeError("duplicate key")))
+
+    with pytest.raises(RuntimeError):
+        medvice.ensure_indexes(db, "key", strict=True)
+
+
+def test_register_refused_without_username_index(app, monkeypatch):
+    monkeypatch.setattr(medvice, "username_index_ready", lambda: False)
+
+    response = app.test_client().post("/register", data={
+        "full_name": "A", "email": "a@example.com", "phone": "1",
+        "username": "a", "password": "p"
+    })
+
+    assert response.status_code == 302
+    assert response.location.endswith("/register")
+
+
+@pytest.mark.parametrize("name", ["development", "testing", "production"])
+def test_hashing_slots_leave_request_threads_free(name):
+    settings = medvice.config[name]
+
+    assert settings.HASH_POOL_WORKERS + settings.HASH_QUEUE_LIMIT < settings.WEB_THREADS
+
+
+def test_procfile_threads_match_config():
+    with open(os.path.join(os.path.dirname(medvice.__file__), "Procfile")) as f:
+        procfile = f.read()
+
+    assert "--threads ${WEB_THREADS:-%d}" % medvice.config["production"].WEB_THREADS in procfile
+
+
+def test_create_app_rejects_hashing_slots_exceeding_threads(monkeypatch):
+    monkeypatch.setattr(TestingConfig, "HASH_QUEUE_LIMIT", TestingConfig.WEB_THREADS)
+
+    with pytest.raises(RuntimeError, match="WEB_THREADS"):
+        medvice.create_app("testing")
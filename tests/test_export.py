@@ -0,0 +1,233 @@
+import csv
+import gzip
+import io
+import json
+from datetime import datetime
+
+import pytest
+import pytz
+from bson.objectid import ObjectId
+
+import app as medvice
+
+
+class FakeCursor:
+    def __init__(self, docs):
+        self.docs = docs
+        self.closed = False
+
+    def __iter__(self):
+        return iter(self.docs)
+
+    def close(self):
+        self.closed = True
+
+
+def make_doc(prediction="Malaria", **extra):
+    doc = {
+        "timestamp": datetime(2025, 3, 1, 4, 30),
+        "prediction": prediction,
+        "description": "Mosquito-borne illness",
+        "medications": ["Chloroquine", "Primaquine"],
+    }
+    doc.update(extra)
+    return doc
+
+
+def test_parse_export_date_is_midnight_ist():
+    parsed = medvice.parse_export_date("2025-03-01")
+
+    assert (parsed.year, parsed.month, parsed.day, parsed.hour) == (2025, 3, 1, 0)
+    assert parsed.utcoffset().total_seconds() == 5.5 * 3600
+
+
+def test_parse_export_date_empty_and_invalid():
+    assert medvice.parse_export_date("") is None
+    assert medvice.parse_export_date(None) is None
+
+    with pytest.raises(ValueError):
+        medvice.parse_export_date("01/03/2025")
+
+
+def test_export_row_fills_missing_fields():
+    row = medvice.export_row({"prediction": "Flu"})
+
+    assert list(row) == medvice.EXPORT_FIELDS
+    assert row["timestamp"] == ""
+    assert row["description"] == ""
+    assert row["workouts"] == []
+
+
+def test_export_row_marks_timestamp_as_utc():
+    row = medvice.export_row(make_doc())
+
+    assert row["timestamp"] == "2025-03-01T04:30:00+00:00"
+
+
+def test_export_chunks_csv_batches_and_closes_cursor():
+    cursor = FakeCursor([make_doc(), make_doc("Flu"), make_doc("Typhoid")])
+
+    chunks = list(medvice.export_chunks(cursor, "csv", batch_size=2))
+    rows = list(csv.reader(io.StringIO("".join(chunks))))
+
+    # Header plus the first full batch, then the one-row remainder
+    assert len(chunks) == 2
+    assert rows[0] == medvice.EXPORT_FIELDS
+    assert [r[1] for r in rows[1:]] == ["Malaria", "Flu", "Typhoid"]
+    assert rows[1][3] == "Chloroquine; Primaquine"
+    assert cursor.closed
+
+
+def test_export_chunks_csv_escapes_formulas():
+    cursor = FakeCursor([make_doc(
+        "=HYPERLINK(\"http://evil\")",
+        description="+1",
+        medications=["@SUM(A1)"],
+        precautions=["-2"]
+    )])
+
+    rows = list(csv.reader(io.StringIO("".join(medvice.export_chunks(cursor, "csv", 500)))))
+
+    assert rows[1][1:5] == ["'=HYPERLINK(\"http://evil\")", "'+1", "'@SUM(A1)", "'-2"]
+
+
+def test_export_chunks_ndjson_keeps_raw_values():
+    cursor = FakeCursor([make_doc("=1+1")])
+
+    lines = "".join(medvice.export_chunks(cursor, "ndjson", 500)).splitlines()
+
+    assert json.loads(lines[0])["prediction"] == "=1+1"
+    assert json.loads(lines[0])["medications"] == ["Chloroquine", "Primaquine"]
+
+
+def test_export_chunks_closes_cursor_when_abandoned():
+    cursor = FakeCursor([make_doc()] * 5)
+
+    chunks = medvice.export_chunks(cursor, "csv", batch_size=1)
+    next(chunks)
+    chunks.close()
+
+    assert cursor.closed
+
+
+def test_gzip_chunks_round_trip():
+    text = ["a,b\n", "", "1,2\n" * 1000]
+
+    assert gzip.decompress(b"".join(medvice.gzip_chunks(text))).decode() == "".join(text)
+
+
+class FakeQuery(FakeCursor):
+    def __init__(self, docs, error=None):
+        super().__init__(docs)
+        self.error = error
+        self.sorted_by = None
+        self.batch = None
+
+    def __iter__(self):
+        if self.error:
+            raise self.error
+        return super().__iter__()
+
+    def sort(self, key, direction):
+        self.sorted_by = (key, direction)
+        return self
+
+    def batch_size(self, size):
+        self.batch = size
+        return self
+
+
+class FakeResults:
+    def __init__(self, docs=(), error=None):
+        self.query = FakeQuery(list(docs), error)
+        self.filter = None
+        self.projection = None
+
+    def find(self, query, projection):
+        self.filter = query
+        self.projection = projection
+        return self.query
+
+
+@pytest.fixture
+def results(monkeypatch):
+    collection = FakeResults([make_doc(), make_doc("Flu")])
+    monkeypatch.setattr(medvice, "results_collection", collection)
+    return collection
+
+
+@pytest.fixture
+def client(app):
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session["user_id"] = str(ObjectId())
+    return client
+
+
+def test_export_requires_login(app, results):
+    response = app.test_client().get("/export")
+
+    assert response.status_code == 302
+    assert response.location.endswith("/login")
+    assert results.filter is None
+
+
+@pytest.mark.parametrize("query", ["format=xml", "start=2025-13-01", "end=01-03-2025"])
+def test_export_rejects_bad_parameters(client, results, query):
+    assert client.get(f"/export?{query}").status_code == 400
+
+
+def test_export_csv_query_and_headers(app, client, results):
+    response = client.get("/export")
+
+    assert response.status_code == 200
+    assert response.mimetype == "text/csv"
+    assert response.headers["Content-Disposition"] == "attachment; filename=medvice_history.csv"
+
+    rows = list(csv.reader(io.StringIO(response.data.decode())))
+    assert [r[1] for r in rows[1:]] == ["Malaria", "Flu"]
+
+    assert list(results.filter) == ["user_id"]
+    assert results.projection == {"_id": 0, **{f: 1 for f in medvice.EXPORT_FIELDS}}
+    assert results.query.sorted_by == ("timestamp", 1)
+    assert results.query.batch == app.config["EXPORT_BATCH_SIZE"]
+    assert results.query.closed
+
+
+def test_export_date_range_is_inclusive_ist(client, results):
+    client.get("/export?start=2025-03-01&end=2025-03-31")
+
+    ist = pytz.timezone("Asia/Kolkata")
+    timestamp = results.filter["timestamp"]
+
+    assert timestamp["$gte"] == ist.localize(datetime(2025, 3, 1))
+    # The whole end day is included: up to midnight IST of the next day
+    assert timestamp["$lt"] == ist.localize(datetime(2025, 4, 1))
+    assert timestamp["$lt"].astimezone(pytz.utc) == datetime(2025, 3, 31, 18, 30, tzinfo=pytz.utc)
+
+
+def test_export_without_dates_has_no_timestamp_filter(client, results):
+    client.get("/export?format=ndjson")
+
+    assert "timestamp" not in results.filter
+
+
+def test_export_ndjson_gzip(client, results):
+    response = client.get("/export?format=ndjson&gzip=1")
+
+    assert response.mimetype == "application/gzip"
+    assert response.headers["Content-Disposition"] == "attachment; filename=medvice_history.ndjson.gz"
+
+    lines = gzip.decompress(response.data).decode().splitlines()
+    assert [json.loads(line)["prediction"] for line in lines] == ["Malaria", "Flu"]
+
+
+def test_export_database_error_is_not_a_download(client, monkeypatch):
+    collection = FakeResults(error=RuntimeError("planner error"))
+    monkeypatch.setattr(medvice, "results_collection", collection)
+
+    response = client.get("/export")
+
+    assert response.status_code == 503
+    assert "Content-Disposition" not in response.headers
+    assert collection.query.closed